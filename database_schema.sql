@@ -10,6 +10,9 @@ CREATE DATABASE signrecipes;
 -- Enable UUID extension for session IDs
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Enable pgvector for semantic caching of chat requests
+CREATE EXTENSION IF NOT EXISTS vector;
+
 -- Products table
 CREATE TABLE products (
     id SERIAL PRIMARY KEY,
@@ -20,6 +23,7 @@ CREATE TABLE products (
     outsourced BOOLEAN DEFAULT FALSE,
     assigned_recipe VARCHAR(255),
     short_description TEXT,
+    embedding vector(1536),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -28,6 +32,7 @@ CREATE TABLE products (
 CREATE INDEX idx_products_name ON products(product_name);
 CREATE INDEX idx_products_category ON products(category);
 CREATE INDEX idx_products_code ON products(product_code);
+CREATE INDEX idx_products_embedding ON products USING hnsw (embedding vector_cosine_ops);
 
 -- Materials table
 CREATE TABLE materials (
@@ -38,6 +43,7 @@ CREATE TABLE materials (
     sub VARCHAR(20),
     thk DECIMAL(8,2),
     grd VARCHAR(20),
+    embedding vector(1536),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -46,6 +52,7 @@ CREATE TABLE materials (
 CREATE INDEX idx_materials_partcode ON materials(partcode);
 CREATE INDEX idx_materials_base ON materials(base);
 CREATE INDEX idx_materials_description ON materials(friendly_description);
+CREATE INDEX idx_materials_embedding ON materials USING hnsw (embedding vector_cosine_ops);
 
 -- Processes table
 CREATE TABLE processes (
@@ -62,6 +69,7 @@ CREATE TABLE processes (
     run_rate_unit VARCHAR(50),
     defect_risk_percent DECIMAL(5,2) DEFAULT 0,
     notes TEXT,
+    embedding vector(1536),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -71,6 +79,7 @@ CREATE INDEX idx_processes_code ON processes(proc_code);
 CREATE INDEX idx_processes_name ON processes(proc_name);
 CREATE INDEX idx_processes_discipline ON processes(discipline);
 CREATE INDEX idx_processes_parent ON processes(parent_id);
+CREATE INDEX idx_processes_embedding ON processes USING hnsw (embedding vector_cosine_ops);
 
 -- Recipes table
 CREATE TABLE recipes (
@@ -112,6 +121,21 @@ CREATE TABLE chat_sessions (
 CREATE INDEX idx_chat_sessions_id ON chat_sessions(session_id);
 CREATE INDEX idx_chat_sessions_created ON chat_sessions(created_at);
 
+-- Semantic cache of generated recipes, keyed by request embedding
+CREATE TABLE chat_cache (
+    id SERIAL PRIMARY KEY,
+    ai_provider VARCHAR(20) NOT NULL,
+    message_hash CHAR(64) NOT NULL,
+    embedding vector(1536),
+    ai_response TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create index for chat cache lookups
+CREATE INDEX idx_chat_cache_provider ON chat_cache(ai_provider);
+CREATE INDEX idx_chat_cache_message ON chat_cache(message_hash);
+CREATE INDEX idx_chat_cache_embedding ON chat_cache USING hnsw (embedding vector_cosine_ops);
+
 -- AI usage tracking table
 CREATE TABLE ai_usage_log (
     id SERIAL PRIMARY KEY,
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy import select
+
+import main
+from conftest import unit_vector
+
+AI_RESPONSE = {
+    "product_match": {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent"},
+    "recipe": [
+        {
+            "recipe_section": "Process",
+            "sequence": "1",
+            "parent_sequence": None,
+            "process_material_code": "PRC-0001",
+            "process_name": "Print",
+            "work_instruction": "Print the panel",
+            "discipline": "Print",
+        }
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_save_recipe_coerces_model_output(db):
+    await main.bulk_insert(db, main.Product, [
+        {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent"},
+    ])
+    await db.commit()
+
+    response = await main.save_recipe(db, main.ChatRequest(message="ACM panel sign"), AI_RESPONSE)
+    await db.commit()
+
+    assert response.recipe.recipe[0].sequence == 1
+    assert (await db.execute(select(main.Recipe.sequence))).scalar_one() == 1
+
+
+async def seed_catalogue(db, monkeypatch):
+    await main.bulk_insert(db, main.Product, [
+        {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent", "embedding": unit_vector(0)},
+    ])
+    await db.commit()
+
+    async def fake_embed_text(value):
+        return unit_vector(0)
+    monkeypatch.setattr(main, "embed_text", fake_embed_text)
+
+
+@pytest.mark.asyncio
+async def test_chat_holds_no_connection_during_provider_call(db, monkeypatch):
+    await seed_catalogue(db, monkeypatch)
+    checked_out = []
+
+    async def fake_create(**kwargs):
+        checked_out.append(main.engine.pool.checkedout())
+        content = orjson.dumps(AI_RESPONSE).decode()
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    monkeypatch.setattr(main.openai_client.chat.completions, "create", fake_create)
+
+    async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+        response = await client.post("/api/chat", json={"message": "ACM panel sign"})
+
+    assert response.status_code == 200
+    assert checked_out == [0]
+    assert (await db.execute(select(main.Recipe.sequence))).scalar_one() == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_holds_no_connection_during_provider_call(db, monkeypatch):
+    await seed_catalogue(db, monkeypatch)
+    checked_out = []
+
+    async def fake_stream():
+        content = orjson.dumps(AI_RESPONSE).decode()
+        for token in (content[:10], content[10:]):
+            checked_out.append(main.engine.pool.checkedout())
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+    async def fake_create(**kwargs):
+        return fake_stream()
+    monkeypatch.setattr(main.openai_client.chat.completions, "create", fake_create)
+
+    async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+        response = await client.post("/api/chat/stream", json={"message": "ACM panel sign"})
+
+    assert response.status_code == 200
+    assert '"done":true' in response.text
+    assert checked_out == [0, 0]
@@ -0,0 +1,43 @@
+import pytest
+
+import main
+from conftest import unit_vector
+
+
+@pytest.mark.asyncio
+async def test_context_falls_back_when_top_k_comes_back_short(db):
+    # Only one product is embedded, and the process is a sub-process the top-K filter drops
+    await main.bulk_insert(db, main.Product, [
+        {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent", "embedding": unit_vector(0)},
+        {"product_code": "PRD-0002", "product_name": "Vinyl Banners", "category": "Temporary"},
+    ])
+    await main.bulk_insert(db, main.Process, [
+        {"proc_code": "PRC-0001", "proc_name": "Print", "discipline": "Print", "parent_id": 0},
+        {"proc_code": "PRC-0002", "proc_name": "Trim", "discipline": "Finishing", "parent_id": 1, "embedding": unit_vector(0)},
+    ])
+    await db.commit()
+
+    context = await main.RecipeAIService(db).get_context(unit_vector(0))
+
+    assert {p["code"] for p in context["sample_products"]} == {"PRD-0001", "PRD-0002"}
+    assert [p["code"] for p in context["sample_processes"]] == ["PRC-0001"]
+
+
+@pytest.mark.asyncio
+async def test_attach_embeddings_skips_blank_rows(monkeypatch):
+    requested = []
+
+    async def fake_embed_texts(values):
+        requested.extend(values)
+        return [unit_vector(i) for i in range(len(values))]
+    monkeypatch.setattr(main, "embed_texts", fake_embed_texts)
+
+    rows = [
+        {"proc_name": "", "discipline": "", "notes": "", "proc_code": ""},
+        {"proc_name": "Print", "discipline": "", "notes": "", "proc_code": "PRC-0001"},
+    ]
+    await main.attach_embeddings(rows, main.PROCESS_SEARCH_FIELDS)
+
+    assert requested == ["Print PRC-0001"]
+    assert "embedding" not in rows[0]
+    assert rows[1]["embedding"] == unit_vector(0)
@@ -0,0 +1,49 @@
+import httpx
+import pytest
+import sqlalchemy.exc
+from sqlalchemy import select
+
+import main
+
+
+async def seed_recipe(db, rows: int):
+    await main.bulk_insert(db, main.Product, [
+        {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent"},
+    ])
+    await main.bulk_insert(db, main.Recipe, [
+        {
+            "product_code": "PRD-0001",
+            "product_name": "ACM Panel Signs",
+            "recipe_section": "Process",
+            "sequence": sequence,
+            "process_material_code": f"PRC-{sequence:04d}",
+            "process_name": "Print",
+            "work_instruction": "Print the panel",
+            "discipline": "Print",
+        }
+        for sequence in range(1, rows + 1)
+    ])
+    await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_download_runs_a_single_query(db):
+    # More rows than one yield_per chunk, so the cursor has to fetch more than once
+    await seed_recipe(db, main.CSV_CHUNK_ROWS + 10)
+
+    async with httpx.AsyncClient(app=main.app, base_url="http://test") as client:
+        with main.count_queries() as queries:
+            response = await client.get("/api/recipe/PRD-0001/download")
+
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == main.CSV_CHUNK_ROWS + 11
+    assert len(queries) <= 1
+
+
+@pytest.mark.asyncio
+async def test_strict_loading_rejects_lazy_loads(db):
+    await seed_recipe(db, 1)
+
+    recipe = (await db.execute(select(main.Recipe))).scalar_one()
+    with pytest.raises(sqlalchemy.exc.InvalidRequestError):
+        await db.run_sync(lambda session: recipe.product)
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+
+import main
+
+MIGRATED_INDEXES = [
+    "idx_processes_embedding",
+    "idx_recipes_product_sequence",
+    "ix_chat_sessions_created_at",
+    "ix_processes_parent_id",
+]
+
+
+@pytest.mark.asyncio
+async def test_init_db_adds_indexes_to_existing_tables(db):
+    # Tables created before the indexes were declared only have their original ones
+    async with main.engine.begin() as conn:
+        for index in MIGRATED_INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+    await main.init_db()
+
+    async with main.engine.connect() as conn:
+        existing = set((await conn.execute(text("SELECT indexname FROM pg_indexes"))).scalars())
+    assert set(MIGRATED_INDEXES) <= existing
+
+
+@pytest.mark.asyncio
+async def test_concurrent_init_db_on_fresh_database(db):
+    # Every worker's lifespan runs init_db at once on first start
+    async with main.engine.begin() as conn:
+        await conn.run_sync(main.Base.metadata.drop_all)
+
+    await asyncio.gather(*(main.init_db() for _ in range(4)))
+
+    async with main.engine.connect() as conn:
+        existing = set((await conn.execute(text("SELECT tablename FROM pg_tables"))).scalars())
+    assert set(main.Base.metadata.tables) <= existing
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select
+
+import main
+from conftest import unit_vector
+
+
+@pytest.mark.asyncio
+async def test_embeddings_insert_and_order_by_distance(db):
+    await main.bulk_insert(db, main.Product, [
+        {"product_code": "PRD-0001", "product_name": "ACM Panel Signs", "category": "Permanent", "embedding": unit_vector(0)},
+        {"product_code": "PRD-0002", "product_name": "Vinyl Banners", "category": "Temporary", "embedding": unit_vector(1)},
+    ])
+    await db.commit()
+    
+    rows = (await db.execute(
+        select(main.Product.product_code, main.Product.embedding)
+        .order_by(main.Product.embedding.cosine_distance(unit_vector(1)))
+    )).all()
+    
+    assert [row.product_code for row in rows] == ["PRD-0002", "PRD-0001"]
+    assert list(rows[0].embedding) == unit_vector(1)
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_round_trip(db, monkeypatch):
+    ai_response = {"product_match": {"product_code": "PRD-0002"}, "recipe": []}
+    await main.store_cached_recipe(db, "openai", "3x2m outdoor banner", unit_vector(2), ai_response)
+    await db.commit()
+    
+    async def fake_embed_text(value):
+        return unit_vector(2)
+    monkeypatch.setattr(main, "embed_text", fake_embed_text)
+    
+    cached_response, embedding = await main.lookup_cached_recipe(db, "openai", "Outdoor banner, 3m x 2m")
+    assert cached_response == ai_response
+    assert embedding == unit_vector(2)
+    
+    cached_response, _ = await main.lookup_cached_recipe(db, "claude", "Outdoor banner, 3m x 2m")
+    assert cached_response is None
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_hit_on_long_message(db):
+    # Far beyond the btree row limit if the message itself were indexed
+    message = "Illuminated fascia sign " * 1000
+    ai_response = {"product_match": {"product_code": "PRD-0001"}, "recipe": []}
+    await main.store_cached_recipe(db, "openai", message, unit_vector(3), ai_response)
+    await db.commit()
+    
+    cached_response, embedding = await main.lookup_cached_recipe(db, "openai", message.upper())
+    assert cached_response == ai_response
+    assert embedding is None